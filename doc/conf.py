@@ -14,26 +14,26 @@ author = 'David Burton'
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#general-configuration
 
 extensions = [
-    'sphinx.ext.autodoc',        # Automatically document code from docstrings
+    'autoapi.extension',         # Document code from docstrings by parsing, not importing, it
     'sphinx.ext.napoleon',       # Support for Google and NumPy-style docstrings
     'sphinx.ext.viewcode',       # Add links to highlighted source code
-    'sphinx.ext.autosummary',    # Create summaries for modules/classes/functions
     'sphinx.ext.doctest',        # Run doctests embedded in documentation
 ]
 
-autosummary_generate = True  # Automatically generate summary pages
+autoapi_type = 'python'
+autoapi_dirs = ['../pyghcli']
+autoapi_add_toctree_entry = True  # Add the generated API reference to the root toctree
 
 doctest_test_doctest_blocks = 'True'  # Enable testing of doctest blocks in documentation
 
 templates_path = ['_templates']
 exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
 
-# Add the ../src directory to sys.path
-import os
+# Add the ../pyghcli directory to sys.path for the doctest builder
 import sys
-sys.path.insert(0, os.path.abspath('../pyghcli'))
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pyghcli"))
 
-print(f"path : {sys.path}")
 # -- Options for HTML output -------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#options-for-html-output
 
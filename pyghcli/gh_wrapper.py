@@ -1,19 +1,454 @@
 import os
 import subprocess
-import dataclasses
-import json
 import sys
-import re
+import shutil
+import tempfile
 import time
-import datetime
 import logging
-import doctest
+import logging.handlers
+import queue
+import re
+import threading
+import atexit
+import functools
+import hashlib
+from array import array
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
 
+import msgpack
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    Example:
+        >>> record = logging.LogRecord("gh", logging.INFO, "gh_wrapper.py", 1, 'say "hi"', None, None, "f")
+        >>> orjson.loads(JsonFormatter().format(record))["message"]
+        'say "hi"'
+    """
+
+    def format(self, record):
+        return orjson.dumps({
+            "Time": self.formatTime(record),
+            "level": record.levelname,
+            "file_name": f"{record.filename}:{record.lineno}",
+            "function": f"{record.funcName}()",
+            "message": record.getMessage(),
+        }).decode()
+
+
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler(sys.stderr)
+_log_stream_handler.setFormatter(JsonFormatter())
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# QueueHandler.prepare() bakes its formatter's output into record.msg, so keep it to the bare message
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.DEBUG, handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+GH_HOST = "github.com"
+API_URL = f"https://api.{GH_HOST}"
+MAX_WORKERS = 16
+PER_PAGE = 100
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "pyghcli"
+ETAG_CACHE_PATH = CACHE_DIR / "etags.msgpack"
+ETAG_CACHE_MAXSIZE = 256
+# The user and repository listing endpoints, the ones fetched again and again
+ETAG_CACHED_PATHS = re.compile(r"/user(/repos)?|/(users|orgs)/[^/]+/repos")
+GET_CACHE_TTL = 60
+GET_CACHE_MAXSIZE = 256
+REPOS_CACHE_TTL = 300
+DEFAULT_API_VERSION = "2022-11-28"
+API_VERSION_HEADER = "X-GitHub-Api-Version"
+PERM_BITS = {'admin': 1, 'push': 2, 'pull': 4, 'maintain': 8, 'triage': 16}
+VIEWER_PERMISSIONS = {
+    'ADMIN': {'admin': True, 'maintain': True, 'push': True, 'triage': True, 'pull': True},
+    'MAINTAIN': {'admin': False, 'maintain': True, 'push': True, 'triage': True, 'pull': True},
+    'WRITE': {'admin': False, 'maintain': False, 'push': True, 'triage': True, 'pull': True},
+    'TRIAGE': {'admin': False, 'maintain': False, 'push': False, 'triage': True, 'pull': True},
+    'READ': {'admin': False, 'maintain': False, 'push': False, 'triage': False, 'pull': True},
+}
+USER_REPOS_QUERY = """
+query($cursor: String) {
+  viewer {
+    repositories(first: 100, after: $cursor,
+                 affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+      pageInfo { hasNextPage endCursor }
+      nodes { nameWithOwner viewerPermission }
+    }
+  }
+}
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def which_gh():
+    """
+    Resolve the path to the gh CLI executable, once per process.
+
+    Returns:
+        str or None: The path to the gh CLI executable, or None if it is not found in the PATH.
+    """
+    return shutil.which('gh')
+
+
+def api_endpoint(api_url):
+    """
+    Build the full URL of a GitHub API endpoint.
+
+    Like `gh api`, the endpoint may be given with or without its leading slash,
+    or as a full URL. gh's {owner}/{repo} placeholders are not filled in.
+    The session sends the GH_HOST token with every request, so full URLs are only
+    accepted under API_URL.
+
+    Args:
+        api_url (str): The API endpoint, e.g. "/user", "user" or "https://api.github.com/user".
+
+    Returns:
+        str: The full URL of the endpoint.
+
+    Raises:
+        ValueError: If api_url is a full URL outside API_URL.
+
+    Example:
+        >>> api_endpoint("user")
+        'https://api.github.com/user'
+        >>> api_endpoint("/user/repos")
+        'https://api.github.com/user/repos'
+        >>> api_endpoint("https://api.github.com/user")
+        'https://api.github.com/user'
+        >>> api_endpoint("http://example.com/x")
+        Traceback (most recent call last):
+        ...
+        ValueError: Refusing to send the GitHub token outside https://api.github.com: http://example.com/x
+    """
+    if "://" in api_url:
+        if not api_url.startswith(f"{API_URL}/"):
+            raise ValueError(f"Refusing to send the GitHub token outside {API_URL}: {api_url}")
+        return api_url
+    return f"{API_URL}/{api_url.lstrip('/')}"
+
+
+def account_key(token):
+    """
+    Derive a short key that identifies the account behind an auth token, for naming its caches.
+
+    Args:
+        token (str): The GitHub auth token.
+
+    Returns:
+        str: A hex digest of the token.
+
+    Example:
+        >>> account_key("token-a") == account_key("token-a") != account_key("token-b")
+        True
+    """
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def read_msgpack_cache(path, max_age=None):
+    """
+    Read a msgpack cache file.
+
+    Args:
+        path (Path): The cache file.
+        max_age (float): Ignore the file if it is at least this many seconds old. Default is no limit.
+
+    Returns:
+        object or None: The cached data, or None if the file is missing, unreadable or too old.
+
+    Example:
+        >>> path = Path(tempfile.mkdtemp()) / "cache.msgpack"
+        >>> read_msgpack_cache(path) is None
+        True
+        >>> write_msgpack_cache(path, {"/user": ["etag", {"login": "octocat"}, {}]})
+        >>> read_msgpack_cache(path)
+        {'/user': ['etag', {'login': 'octocat'}, {}]}
+
+        A file older than max_age is treated as missing, which is how the repo cache expires:
+
+        >>> read_msgpack_cache(path, max_age=REPOS_CACHE_TTL) is None
+        False
+        >>> read_msgpack_cache(path, max_age=0) is None
+        True
+    """
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime >= max_age:
+            return None
+        with open(path, "rb") as cache_file:
+            return msgpack.unpack(cache_file)
+    except (OSError, ValueError, msgpack.UnpackException):
+        return None
+
+
+def write_msgpack_cache(path, data):
+    """
+    Write data to a msgpack cache file, creating its directory if needed.
+
+    The caches hold private repository and user data, so the directory is created
+    owner-only and the file is written 0600. The data goes to a temporary file that
+    then replaces path, so concurrent runs never read a half-written cache.
+
+    Args:
+        path (Path): The cache file.
+        data (object): The data to cache.
+
+    Raises:
+        OSError: If the file cannot be written.
+
+    Example:
+        >>> path = Path(tempfile.mkdtemp()) / "pyghcli" / "cache.msgpack"
+        >>> write_msgpack_cache(path, [1])
+        >>> oct(path.stat().st_mode & 0o777), oct(path.parent.stat().st_mode & 0o777)
+        ('0o600', '0o700')
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as cache_file:
+            msgpack.pack(data, cache_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_etag_lock = threading.Lock()
+_etag_caches_dirty = False
+
+
+@functools.lru_cache(maxsize=1)
+def etag_caches():
+    """
+    Get the ETag caches of every account, loaded from ETAG_CACHE_PATH on first use.
+
+    Each account's cache holds at most ETAG_CACHE_MAXSIZE entries in least to most
+    recently used order.
+
+    Returns:
+        dict: A dictionary mapping account keys to {request URL: (etag, raw body, links)} caches.
+    """
+    return read_msgpack_cache(ETAG_CACHE_PATH) or {}
+
+
+def save_etag_caches():
+    """
+    Persist the ETag caches at exit, so conditional requests survive a restart.
+
+    Nothing is written unless a response was added to the caches in this process.
+    """
+    if not _etag_caches_dirty:
+        return
+    try:
+        write_msgpack_cache(ETAG_CACHE_PATH, etag_caches())
+    except OSError as e:
+        logging.getLogger(__name__).error("Could not save the ETag cache to %s: %s", ETAG_CACHE_PATH, e)
+
+
+# Registered after the log listener, so it runs while the listener is still up
+atexit.register(save_etag_caches)
+
+
+def etag_headers(etag_cache, cache_key):
+    """
+    Build the conditional request headers for a cached GET response.
+
+    Args:
+        etag_cache (dict): An account's ETag cache, see etag_caches.
+        cache_key (str): The request URL.
+
+    Returns:
+        dict: An If-None-Match header if the URL has a cached ETag, else nothing.
+
+    Example:
+        >>> etag_headers({}, "https://api.github.com/user")
+        {}
+        >>> etag_headers({"https://api.github.com/user": ('"abc"', b'{}', {})}, "https://api.github.com/user")
+        {'If-None-Match': '"abc"'}
+    """
+    cached = etag_cache.get(cache_key)
+    return {"If-None-Match": cached[0]} if cached else {}
+
+
+def etag_cacheable(cache_key):
+    """
+    Tell whether responses for a request URL are kept in the ETag cache.
+
+    Only the user and repository listing endpoints are; searches and other one-off
+    GETs would just fill the cache.
+
+    Args:
+        cache_key (str): The request URL.
+
+    Returns:
+        bool: True if the URL matches ETAG_CACHED_PATHS.
+
+    Example:
+        >>> etag_cacheable("https://api.github.com/user/repos?per_page=100&page=2")
+        True
+        >>> etag_cacheable("https://api.github.com/search/repositories?q=x")
+        False
+    """
+    return ETAG_CACHED_PATHS.fullmatch(urlparse(cache_key).path) is not None
+
+
+def revalidate(etag_cache, cache_key, response, maxsize=ETAG_CACHE_MAXSIZE):
+    """
+    Resolve a conditional GET response against the ETag cache.
+
+    A 304 Not Modified returns the cached body and Link entries. Any other response
+    carrying an ETag for an etag_cacheable URL replaces the cache entry, evicting the
+    least recently used entries beyond maxsize.
+
+    Args:
+        etag_cache (dict): An account's ETag cache, see etag_caches.
+        cache_key (str): The request URL.
+        response (requests.Response): The response to the request sent with etag_headers.
+        maxsize (int): The most entries to keep in etag_cache.
+
+    Returns:
+        tuple: The raw response body (or None if a 304's entry was evicted meanwhile)
+        and the response's Link header entries.
+
+    Example:
+        >>> from types import SimpleNamespace
+        >>> cache = {}
+        >>> ok = SimpleNamespace(status_code=200, content=b'[1]', headers={"ETag": '"abc"'}, links={"next": {}})
+        >>> revalidate(cache, "https://api.github.com/user", ok)
+        (b'[1]', {'next': {}})
+        >>> not_modified = SimpleNamespace(status_code=304, content=b'', headers={}, links={})
+        >>> revalidate(cache, "https://api.github.com/user", not_modified)
+        (b'[1]', {'next': {}})
+        >>> _ = revalidate(cache, "https://api.github.com/user/repos", ok, maxsize=1)
+        >>> list(cache)
+        ['https://api.github.com/user/repos']
+        >>> _ = revalidate(cache, "https://api.github.com/search/repositories?q=x", ok)
+        >>> list(cache)
+        ['https://api.github.com/user/repos']
+    """
+    global _etag_caches_dirty
+    with _etag_lock:
+        if response.status_code == 304:
+            entry = etag_cache.pop(cache_key, None)
+            if entry is None:
+                # Evicted by another thread since etag_headers was built
+                return None, {}
+            # Re-insert the entry to mark it most recently used
+            etag_cache[cache_key] = entry
+            return entry[1], entry[2]
+        etag = response.headers.get("ETag")
+        if etag and etag_cacheable(cache_key):
+            etag_cache.pop(cache_key, None)
+            etag_cache[cache_key] = (etag, response.content, response.links)
+            while len(etag_cache) > maxsize:
+                del etag_cache[next(iter(etag_cache))]
+            _etag_caches_dirty = True
+    return response.content, response.links
+
+
+def page_items(page):
+    """
+    Extract the items of one page of a paginated listing.
+
+    Most listings are JSON arrays; search endpoints wrap theirs in an object with an
+    "items" array.
+
+    Args:
+        page (list or dict): The parsed page.
+
+    Returns:
+        list or None: The items of the page, or None if it is neither shape.
+
+    Example:
+        >>> page_items([{"id": 1}, {"id": 2}])
+        [{'id': 1}, {'id': 2}]
+        >>> page_items({"total_count": 2, "incomplete_results": False, "items": [{"id": 1}, {"id": 2}]})
+        [{'id': 1}, {'id': 2}]
+        >>> page_items({"message": "Not Found"}) is None
+        True
+    """
+    if isinstance(page, list):
+        return page
+    if isinstance(page, dict) and isinstance(page.get("items"), list):
+        return page["items"]
+    return None
+
+
+def last_page_number(links):
+    """
+    Read the last page number of a paginated listing from its Link header entries.
+
+    Args:
+        links (dict): The parsed Link header, as in requests.Response.links.
+
+    Returns:
+        int: The number of the last page, 1 if the listing has a single page.
+
+    Example:
+        >>> last_page_number({"next": {"url": "https://api.github.com/search/repositories?q=x&per_page=100&page=2"},
+        ...                   "last": {"url": "https://api.github.com/search/repositories?q=x&per_page=100&page=4"}})
+        4
+        >>> last_page_number({})
+        1
+    """
+    last_url = links.get("last", {}).get("url")
+    if last_url is None:
+        return 1
+    return int(parse_qs(urlparse(last_url).query)["page"][0])
+
+
+def graphql_repo(node):
+    """
+    Convert a GraphQL repository node into the REST "full_name"/"permissions" shape.
+
+    Args:
+        node (dict): A repository node with nameWithOwner and viewerPermission.
+
+    Returns:
+        dict: The repository as the REST API would describe it.
+
+    Example:
+        >>> repo = graphql_repo({"nameWithOwner": "octocat/hello", "viewerPermission": "WRITE"})
+        >>> repo["full_name"], perm_bitmask(repo["permissions"]) == PERM_BITS["push"] | PERM_BITS["triage"] | PERM_BITS["pull"]
+        ('octocat/hello', True)
+        >>> graphql_repo({"nameWithOwner": "octocat/hello", "viewerPermission": None})["permissions"]
+        {}
+    """
+    return {'full_name': node['nameWithOwner'], 'permissions': VIEWER_PERMISSIONS.get(node['viewerPermission'], {})}
+
+
+def perm_bitmask(permissions):
+    """
+    Fold a repository's permissions object into a PERM_BITS bitmask.
+
+    Args:
+        permissions (dict): The "permissions" object of a repository, e.g. {"admin": False, "pull": True}.
+
+    Returns:
+        int: The bitmask of the granted permissions.
+
+    Example:
+        >>> perm_bitmask({"admin": False, "push": True, "pull": True})
+        6
+    """
+    bits = 0
+    for permission, granted in permissions.items():
+        if granted:
+            bits |= PERM_BITS.get(permission, 0)
+    return bits
 
 
-FORMAT = '{"Time": "%(asctime)s", "level": "%(levelname)s","file_name":"%(filename)s:%(lineno)s", "function":"%(funcName)s()", "message":"%(message)s"}'
-logging.basicConfig(format=FORMAT, level=logging.DEBUG)
-    
 class GH_CLI():
     """
     A class for interacting with the GitHub CLI (gh).
@@ -22,14 +457,19 @@ class GH_CLI():
         api_version (str): The GitHub API version to use.
         username (str): The username of the authenticated user.
         gh_cli_path (str): Path to the gh CLI executable.
-        repos_raw (list): List of raw repository data for the user.
-        repo_perm_index (dict): A dictionary mapping repository names to permissions.
+        repos_raw (list): List of repository data for the user, each with "full_name" and "permissions".
+        repo_names (list): Full names of the user's repositories, in repos_raw order.
+        repo_perm_bits (array): Permission bitmask (see PERM_BITS) of each repository in repo_names.
+        repo_perm_index (dict): A dictionary mapping repository names to lists of granted permissions.
     """
 
-    def __init__ (self, api_version= "2022-11-28"):
+    def __init__ (self, api_version=DEFAULT_API_VERSION):
         """
         Initialize the GH_CLI instance.
 
+        Repository data is only fetched when username, repos_raw or repo_perm_index
+        is first accessed.
+
         Args:
             api_version (str): The GitHub API version to use. Default is "2022-11-28".
 
@@ -42,27 +482,163 @@ class GH_CLI():
         self.logger = logging.getLogger(__name__)
         self.gh_cli_path = self.get_gh_cli_path()
         self._api_version = api_version
-        self.api_version_header = f"X-GitHub-API-Version:{self._api_version}"        
-        self._user = self.run_gh_command("api", "/user")
-        self.username = self._user['login']
-        self.repos_raw = self.pull_all_user_repos()
-        self.repo_perm_index = self.setup_repo_index()
-
-        
+        self.api_version_header = f"{API_VERSION_HEADER}:{self._api_version}"
+        self._cmd_prefix = (self.gh_cli_path, "-H", self.api_version_header)
+        self._token = self.get_gh_auth_token()
+        self._account = account_key(self._token)
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self._token}",
+            "Accept": "application/vnd.github+json",
+            API_VERSION_HEADER: self._api_version,
+        })
+        self._session.mount(API_URL, HTTPAdapter(pool_maxsize=MAX_WORKERS))
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        self._get_cache = {}
+        self._get_cache_lock = threading.Lock()
         pass
+
+    @functools.cached_property
+    def _etag_cache(self):
+        """The account's ETag cache, loaded from disk on the first GET."""
+        return etag_caches().setdefault(self._account, {})
+
+    @functools.cached_property
+    def _user(self):
+        """The authenticated user, fetched on first access."""
+        return self.run_gh_api_get("/user")
+
+    @functools.cached_property
+    def username(self):
+        """
+        The username of the authenticated user, fetched on first access.
+
+        Raises:
+            ValueError: If the authenticated user could not be fetched.
+        """
+        if self._user is None:
+            raise ValueError("Could not fetch the authenticated user from /user, see the logged request error")
+        return self._user['login']
+
+    @functools.cached_property
+    def repos_raw(self):
+        """
+        The raw repository data of the user, read from the repo cache or pulled on first access.
+
+        None if the pull failed; only complete pulls are written to the repo cache.
+        """
+        repos = self.load_repos_cache()
+        if repos is None:
+            repos = self.pull_all_user_repos()
+            if repos is not None:
+                self.save_repos_cache(repos)
+        return repos
+
+    @functools.cached_property
+    def _repo_index(self):
+        """The (repo_names, repo_perm_bits, _name_to_idx) index, built on first access."""
+        return self.setup_repo_index()
+
+    @property
+    def repo_names(self):
+        """The full names of the user's repositories."""
+        return self._repo_index[0]
+
+    @property
+    def repo_perm_bits(self):
+        """The permission bitmasks of the user's repositories."""
+        return self._repo_index[1]
+
+    @property
+    def _name_to_idx(self):
+        """The position of each repository in repo_names."""
+        return self._repo_index[2]
+
+    @functools.cached_property
+    def repo_perm_index(self):
+        """A dictionary mapping repository names to lists of granted permissions, built on first access."""
+        return {full_name: self.get_repo_permissions(full_name) for full_name in self.repo_names}
+
     def setup_repo_index(self):
         """
-        Set up a dictionary mapping repository names to permissions.
+        Set up the repository permission index.
+
+        Names and permission bitmasks are kept in parallel arrays rather than a list
+        of permissions per repository.
+
+        Returns:
+            tuple: The repository names, an array of their permission bitmasks, and a
+            dictionary mapping each name to its position in both.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> names, perm_bits, name_to_idx = gh.setup_repo_index()
+            >>> len(names) == len(perm_bits) == len(name_to_idx)
+            True
+        """
+        names = []
+        perm_bits = array('B')
+        for full_name, permissions in self.iter_repo_permissions():
+            names.append(full_name)
+            perm_bits.append(perm_bitmask(permissions))
+        return names, perm_bits, dict(zip(names, range(len(names))))
+
+    def has_perm(self, repo_name, permission):
+        """
+        Check whether the user holds a permission on a repository.
+
+        Args:
+            repo_name (str): The full name of the repository, e.g. "owner/repo".
+            permission (str): One of the keys of PERM_BITS.
+
+        Returns:
+            bool: True if the permission is granted.
+
+        Raises:
+            KeyError: If the repository or the permission is unknown.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> all(gh.has_perm(name, 'pull') for name in gh.repo_names)
+            True
+        """
+        idx = self._name_to_idx[repo_name]
+        return bool(self.repo_perm_bits[idx] & PERM_BITS[permission])
+
+    def get_repo_permissions(self, repo_name):
+        """
+        Get the permissions the user holds on a repository.
+
+        Args:
+            repo_name (str): The full name of the repository, e.g. "owner/repo".
+
+        Returns:
+            list: The granted permissions.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> all('pull' in gh.get_repo_permissions(name) for name in gh.repo_names)
+            True
+        """
+        idx = self._name_to_idx[repo_name]
+        bits = self.repo_perm_bits[idx]
+        return [permission for permission, bit in PERM_BITS.items() if bits & bit]
+
+    def iter_repo_permissions(self):
+        """
+        Iterate over the name and permissions of each repository, skipping every other field.
+
+        Nothing is yielded if repos_raw could not be pulled.
 
         Returns:
-            dict: A dictionary where keys are repository names and values are lists of permissions.
+            iterator: (full_name, permissions) tuples, one per repository.
 
         Example:
             >>> gh = GH_CLI()
-            >>> isinstance(gh.repo_perm_index, dict)
+            >>> all(isinstance(name, str) for name, _ in gh.iter_repo_permissions())
             True
         """
-        return {repo['full_name']:[permission for permission in repo['permissions'] if permission] for repo in self.repos_raw} 
+        return map(itemgetter('full_name', 'permissions'), self.repos_raw or ())
     
     def get_gh_cli_path(self):
         """
@@ -79,11 +655,35 @@ class GH_CLI():
             >>> isinstance(gh.gh_cli_path, str)
             True
         """
+        gh_cli_path = which_gh()
+        if gh_cli_path is None:
+            self.logger.error("gh CLI not found in PATH")
+            sys.exit(1)
+        return gh_cli_path
+
+    def get_gh_auth_token(self):
+        """
+        Get the auth token of the gh CLI's logged in user on GH_HOST.
+
+        The token is read once and reused by the HTTP session for every API call.
+        The host is given explicitly, so a GH_HOST environment variable pointing at an
+        Enterprise server never hands that server's token to API_URL.
+
+        Returns:
+            str: The GitHub auth token.
+
+        Raises:
+            SystemExit: If the gh CLI is not authenticated.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> isinstance(gh.get_gh_auth_token(), str)
+            True
+        """
         try:
-            gh_cli_path = subprocess.check_output(['which', 'gh']).decode('utf-8').strip()
-            return gh_cli_path
+            return subprocess.check_output([self.gh_cli_path, "auth", "token", "--hostname", GH_HOST]).decode('utf-8').strip()
         except subprocess.CalledProcessError:
-            self.logger.error("gh CLI not found in PATH")
+            self.logger.error("gh CLI is not authenticated, run `gh auth login`")
             sys.exit(1)
     def log_cli_error(self, command, error: Exception, *args):
         """
@@ -106,6 +706,9 @@ class GH_CLI():
         """
         Run a gh CLI command and return the output.
 
+        API calls go through run_gh_api_request; this is kept for gh subcommands
+        that have no REST equivalent.
+
         Args:
             command (str): The gh CLI command to run.
             *args: Additional arguments for the command.
@@ -119,38 +722,36 @@ class GH_CLI():
             >>> isinstance(result, dict)
             True
         """
-        _subprocess_cmd = [self.gh_cli_path, "-H", f"{self.api_version_header}" , command, *args]
-        self.logger.debug(f"run_gh_command _subprocess_cmd{_subprocess_cmd}")
-        _gh_run = subprocess.run(_subprocess_cmd, capture_output=True, text=True)
+        _subprocess_cmd = (*self._cmd_prefix, command, *args)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("run_gh_command _subprocess_cmd %s", _subprocess_cmd)
+        _gh_run = subprocess.run(_subprocess_cmd,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE if self.logger.isEnabledFor(logging.DEBUG) else subprocess.DEVNULL,
+                                 bufsize=-1,
+                                 check=False,
+                                 )
+        if _gh_run.returncode != 0 and _gh_run.stderr:
+            self.logger.debug("gh command exited with %s: %s %s", _gh_run.returncode, command, _gh_run.stderr)
         try:
-            output = json.loads(_gh_run.stdout)
-            logging.debug (f"Running gh command: {command} {[i for i in args]}")
-            if isinstance(output, dict) and 'status' in output.keys():
-                match output['status']:
-                    case '200':
-                        logging.info(f"Success running gh command: {command} \t {len(output)}")
-                    case '201':
-                        logging.info(f"Success running gh command: {command} \t {len(output)}")
-                    case '204':
-                        logging.info(f"Success running gh command: {command} \t {len(output)}")
-                    case '404':
-                        raise ValueError(output)
-                    case '422':
-                        raise ValueError(output)
-                    case _:
-                        logging.error(f"Error running gh command: {command} \t {output}")
-                        raise ValueError(output)            
-            return output
+            output = orjson.loads(_gh_run.stdout)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Running gh command: %s %s", command, args)
+            if _gh_run.returncode == 0:
+                return output
+            # gh exits nonzero on HTTP errors and prints the error body; any such status is an error,
+            # logged like a failed request in _send_api_request
+            raise ValueError(output)
         except subprocess.CalledProcessError as e:     
             self.log_cli_error(command=command,
                                error=e,
                                )
+        except orjson.JSONDecodeError as e:
+            self.logger.debug("gh command returned non-json output: %s %s", command, _gh_run.stdout)
         except ValueError as e:
             self.log_cli_error(command=command,
                                error=e,
                                )
-        except json.JSONDecodeError as e:
-            logging.debug(f"gh command returned non-json output: {command} {_gh_run.stdout}")
         
         except Exception as e:
             self.log_cli_error(
@@ -161,15 +762,182 @@ class GH_CLI():
         
         
 
+    def _send_api_request(self, method, api_url, **kwargs):
+        """
+        Send a request straight to the GitHub REST API over the shared HTTP session.
+
+        Args:
+            method (str): The HTTP method to use.
+            api_url (str): The API endpoint to call, see api_endpoint.
+            **kwargs: Additional arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response or None: The response, or None if an error occurred.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("run_gh_api_request %s %s %s", method, api_url, kwargs.get('params'))
+        try:
+            response = self._session.request(method, api_endpoint(api_url), **kwargs)
+            response.raise_for_status()
+            return response
+        except (requests.RequestException, ValueError) as e:
+            self.log_cli_error(f"{method} {api_url}", e)
+            return None
+
+    def run_gh_api_request(self, method, api_url, **kwargs):
+        """
+        Run a request against the GitHub REST API and return the parsed output.
+
+        Args:
+            method (str): The HTTP method to use.
+            api_url (str): The API endpoint to call.
+            **kwargs: Additional arguments passed to requests.Session.request.
+
+        Returns:
+            dict, list or None: The parsed JSON response, or None if an error occurred
+            or the response has no body.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> result = gh.run_gh_api_request("GET", "/user")
+            >>> isinstance(result, dict)
+            True
+        """
+        response = self._send_api_request(method, api_url, **kwargs)
+        return self._parse_api_content(None if response is None else response.content, method, api_url)
+
+    def _parse_api_content(self, content, method, api_url):
+        """
+        Parse the JSON body of an API response.
+
+        Every call builds new objects, so callers are free to modify the result.
+
+        Args:
+            content (bytes or None): The raw response body.
+            method (str): The HTTP method of the request, for logging.
+            api_url (str): The API endpoint of the request, for logging.
+
+        Returns:
+            dict, list or None: The parsed JSON response, or None if there is no JSON body.
+        """
+        if not content:
+            return None
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            self.logger.debug("gh api returned non-json output: %s %s", method, api_url)
+            return None
+
+    def _get(self, api_url, params=None):
+        """
+        Run a GET request, revalidating any cached copy of the response with its ETag.
+
+        A 304 Not Modified answer returns the cached body without transferring it again.
+
+        Args:
+            api_url (str): The API endpoint to call.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            tuple: The raw response body (or None) and the response's Link header entries.
+        """
+        try:
+            endpoint = api_endpoint(api_url)
+        except ValueError as e:
+            self.log_cli_error(f"GET {api_url}", e)
+            return None, {}
+        cache_key = f"{endpoint}?{urlencode(params)}" if params else endpoint
+        headers = etag_headers(self._etag_cache, cache_key)
+        response = self._send_api_request("GET", api_url, params=params, headers=headers)
+        if response is None:
+            return None, {}
+        return revalidate(self._etag_cache, cache_key, response)
+
+    def run_gh_api_get_paginated(self, api_url):
+        """
+        GET every page of a paginated API listing.
+
+        The first page is fetched to read the last page number from the Link header,
+        the remaining pages are then fetched concurrently on the instance's executor.
+        Pages are merged with page_items, so for search endpoints the result is the
+        concatenated "items" arrays.
+
+        Args:
+            api_url (str): The API endpoint to call.
+
+        Returns:
+            list or None: The items of all pages, in page order, or None if any page failed
+            or is not a listing.
+
+        Example:
+            >>> gh = GH_CLI()
+            >>> repos = gh.run_gh_api_get_paginated("/user/repos")
+            >>> isinstance(repos, list)
+            True
+        """
+        content, links = self._get(api_url, params={"per_page": PER_PAGE, "page": 1})
+        first_page = self._parse_api_content(content, "GET", api_url)
+        if first_page is None:
+            return None
+        pages = self._executor.map(
+            lambda page: self._parse_api_content(self._get(api_url, params={"per_page": PER_PAGE, "page": page})[0], "GET", api_url),
+            range(2, last_page_number(links) + 1),
+        )
+        items = []
+        for page in (first_page, *pages):
+            if page is None:
+                return None
+            page_list = page_items(page)
+            if page_list is None:
+                self.log_cli_error(f"GET {api_url}", ValueError(f"not a paginated listing: {page}"))
+                return None
+            items.extend(page_list)
+        return items
+
+    @property
+    def repos_cache_path(self):
+        """
+        Path of the msgpack repo cache, unique to the authenticated account.
+
+        The file is named after a hash of the auth token, so finding it needs no API call.
+        """
+        return CACHE_DIR / f"repos-{self._account}.msgpack"
+
+    def load_repos_cache(self):
+        """
+        Load the repositories saved by a previous run, if they are fresher than REPOS_CACHE_TTL seconds.
+
+        Returns:
+            list or None: The cached repositories, or None if there is no fresh cache.
+        """
+        return read_msgpack_cache(self.repos_cache_path, max_age=REPOS_CACHE_TTL)
+
+    def save_repos_cache(self, repos):
+        """
+        Persist the repositories so the next run can skip pulling them.
+
+        Args:
+            repos (list): The repositories to save.
+        """
+        try:
+            write_msgpack_cache(self.repos_cache_path, repos)
+        except OSError as e:
+            self.logger.error("Could not save the repo cache to %s: %s", self.repos_cache_path, e)
+
     def run_gh_api_get(self, api_url):
         """
-        Run a GET request using the gh CLI.
+        Run a GET request against the GitHub API.
+
+        Responses are reused for GET_CACHE_TTL seconds without a request; past that
+        they are revalidated with their ETag. At most GET_CACHE_MAXSIZE responses are
+        kept, as raw bytes parsed again on every call, so the result is the caller's
+        to modify.
 
         Args:
             api_url (str): The API endpoint to call.
 
         Returns:
-            dict or None: The parsed JSON output from the command, or None if an error occurred.
+            dict or None: The parsed JSON response, or None if an error occurred.
 
         Example:
             >>> gh = GH_CLI()
@@ -177,33 +945,71 @@ class GH_CLI():
             >>> isinstance(result, dict)
             True
         """
-        return  self.run_gh_command("api", api_url)
+        try:
+            cache_key = api_endpoint(api_url)
+        except ValueError as e:
+            self.log_cli_error(f"GET {api_url}", e)
+            return None
+        with self._get_cache_lock:
+            cached = self._get_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < GET_CACHE_TTL:
+            return self._parse_api_content(cached[1], "GET", api_url)
+        content = self._get(api_url)[0]
+        output = self._parse_api_content(content, "GET", api_url)
+        if output is not None:
+            self._store_get_cache(cache_key, content)
+        return output
+
+    def _store_get_cache(self, cache_key, content):
+        """
+        Store a response in the TTL cache of run_gh_api_get.
+
+        Entries are kept oldest first, so expired entries, and the oldest ones beyond
+        GET_CACHE_MAXSIZE, are evicted from the front.
+
+        Args:
+            cache_key (str): The request URL.
+            content (bytes): The raw response body.
+        """
+        with self._get_cache_lock:
+            now = time.monotonic()
+            self._get_cache.pop(cache_key, None)
+            while self._get_cache:
+                oldest = next(iter(self._get_cache))
+                if len(self._get_cache) < GET_CACHE_MAXSIZE and now - self._get_cache[oldest][0] < GET_CACHE_TTL:
+                    break
+                del self._get_cache[oldest]
+            self._get_cache[cache_key] = (now, content)
     
-    def run_gh_api_post(self, api_url, *args):
+    def run_gh_api_post(self, api_url, payload=None):
         """
-        Run a POST request using the gh CLI.
+        Run a POST request against the GitHub API.
 
         Args:
             api_url (str): The API endpoint to call.
-            *args: Additional arguments for the POST request.
+            payload (dict): The JSON body of the POST request.
 
         Returns:
-            dict or None: The parsed JSON output from the command, or None if an error occurred.
+            dict or None: The parsed JSON response, or None if an error occurred.
 
         Example:
             >>> gh = GH_CLI()
-            >>> result = gh.run_gh_api_post("/some/endpoint", "--field", "value")
+            >>> result = gh.run_gh_api_post("/some/endpoint", {"field": "value"})
             >>> result is None or isinstance(result, dict)
             True
         """
-        return self.run_gh_command("api", api_url, '-X', "POST", *args)
+        return self.run_gh_api_request("POST", api_url, json=payload)
 
     def pull_all_user_repos(self):
         """
-        Pull all repositories for the authenticated user.
+        Pull all repositories the authenticated user has access to, private ones included.
+
+        A single GraphQL query per 100 repositories asks only for the name and the
+        viewer's permission, which are returned in the REST "full_name" and
+        "permissions" shape.
 
         Returns:
-            list: A list of repositories.
+            list or None: A list of repositories, or None if any page failed.
 
         Example:
             >>> gh = GH_CLI()
@@ -211,7 +1017,20 @@ class GH_CLI():
             >>> isinstance(repos, list)
             True
         """
-        return self.run_gh_api_get(f"/users/{self.username}/repos")
+        repos = []
+        cursor = None
+        while True:
+            output = self.run_gh_api_post("/graphql", {"query": USER_REPOS_QUERY, "variables": {"cursor": cursor}})
+            if output is None:
+                return None
+            if 'errors' in output:
+                self.log_cli_error("POST /graphql", ValueError(output['errors']))
+                return None
+            page = output['data']['viewer']['repositories']
+            repos.extend(map(graphql_repo, page['nodes']))
+            if not page['pageInfo']['hasNextPage']:
+                return repos
+            cursor = page['pageInfo']['endCursor']
     
 
 